@@ -249,7 +249,7 @@ SWAGGER_SETTINGS = {
     'SHOW_REQUEST_HEADERS': True,
     'JSON_EDITOR': True,
     'APIS_SORTER': 'alpha',
-    'DEFAULT_INFO': 'config.urls.schema_view.info',
+    'DEFAULT_INFO': 'config.swagger.API_INFO',
     'DEFAULT_API_URL': 'https://bartrlatest-8l446.sevalla.app/api/',
 }
 
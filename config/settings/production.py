@@ -1,42 +1,74 @@
+import json
+import os
+import re
+
+from django.core.exceptions import ImproperlyConfigured
+
 from .base import * # NOQA
 
+# Snapshot of the environment, taken once after base.py has loaded the .env file.
+_ENV = dict(os.environ)
+_MISSING = object()
+
+
+def _to_bool(value):
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in ('true', 'on', 'ok', 'y', 'yes', '1')
+
+
+def _env_get(key, default=_MISSING, cast=None):
+    """
+        Read a setting from the environment snapshot, raising if a required key is absent.
+    """
+    value = _ENV.get(key, default)
+    if value is _MISSING:
+        raise ImproperlyConfigured('Set the {} environment variable'.format(key))
+    if cast is not None and value is not None:
+        return cast(value)
+    return value
+
+
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
+DEBUG = _env_get('DJANGO_DEBUG', False, _to_bool)
+if DEBUG and not _env_get('ALLOW_DEBUG_PROD', False, _to_bool):
+    raise ImproperlyConfigured('DJANGO_DEBUG is enabled in production; set ALLOW_DEBUG_PROD to confirm')
 
-ALLOWED_HOSTS = ['localhost','127.0.0.1','0.0.0.0','bartrlatest-8l446.sevalla.app','api.bartr.club']
+ALLOWED_HOSTS = ('localhost', '127.0.0.1', '0.0.0.0', 'bartrlatest-8l446.sevalla.app', 'api.bartr.club')
 
-CSRF_TRUSTED_ORIGINS = [
+CSRF_TRUSTED_ORIGINS = (
     'https://*.kinsta.app',
     'https://*.sevalla.app',
     'https://bartrlatest-8l446.sevalla.app',
-    'https://api.bartr.club'
-]
+    'https://api.bartr.club',
+)
 
 # CORS Configuration for Production
 CORS_ORIGIN_ALLOW_ALL = True
 CORS_ALLOW_CREDENTIALS = True
-CORS_ALLOWED_ORIGINS = [
+CORS_ALLOWED_ORIGINS = (
     'https://bartrlatest-8l446.sevalla.app',
     'https://api.bartr.club',
     'http://localhost:3000',
     'http://127.0.0.1:3000',
-]
+)
 
-CORS_ALLOWED_ORIGIN_REGEXES = [
-    r"^https://\w+\.sevalla\.app$",
-    r"^https://\w+\.kinsta\.app$",
-]
+# Compiled once here; django-cors-headers matches origins with re.match, which accepts patterns.
+CORS_ALLOWED_ORIGIN_REGEXES = (
+    re.compile(r"^https://\w+\.sevalla\.app$"),
+    re.compile(r"^https://\w+\.kinsta\.app$"),
+)
 
-CORS_ALLOW_METHODS = [
+CORS_ALLOW_METHODS = (
     'DELETE',
     'GET',
     'OPTIONS',
     'PATCH',
     'POST',
     'PUT',
-]
+)
 
-CORS_ALLOW_HEADERS = [
+CORS_ALLOW_HEADERS = (
     'accept',
     'accept-encoding',
     'authorization',
@@ -46,11 +78,11 @@ CORS_ALLOW_HEADERS = [
     'user-agent',
     'x-csrftoken',
     'x-requested-with',
-]
+)
 
 
 # ADMINS
-ADMINS = env.json('ADMINS')
+ADMINS = _env_get('ADMINS', cast=json.loads)
 
 # Database
 # https://docs.djangoproject.com/en/2.2/ref/settings/#databases
@@ -59,12 +91,12 @@ INSTALLED_APPS += ["storages"]
 
 DATABASES = {
     'default': {
-        'ENGINE': env('ENGINE'),
-        'NAME': env('DB_NAME'),
-        'USER': env('DB_USER'),
-        'PASSWORD': env('DB_PASSWORD'),
-        'HOST': env('DB_HOST'),
-        'PORT': env('DB_PORT'),
+        'ENGINE': _env_get('ENGINE'),
+        'NAME': _env_get('DB_NAME'),
+        'USER': _env_get('DB_USER'),
+        'PASSWORD': _env_get('DB_PASSWORD'),
+        'HOST': _env_get('DB_HOST'),
+        'PORT': _env_get('DB_PORT'),
     }
 }
 
@@ -74,25 +106,25 @@ EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
 EMAIL_HOST = 'smtp.gmail.com'
 EMAIL_USE_TLS = True
 EMAIL_PORT = 587
-EMAIL_HOST_USER = env('EMAIL_HOST_USER')
-EMAIL_HOST_PASSWORD = env('EMAIL_HOST_PASSWORD')
-DEFAULT_FROM_EMAIL = SERVER_EMAIL = env('SERVER_EMAIL_SIGNATURE') + ' <%s>' % env('SERVER_EMAIL')
+EMAIL_HOST_USER = _env_get('EMAIL_HOST_USER')
+EMAIL_HOST_PASSWORD = _env_get('EMAIL_HOST_PASSWORD')
+DEFAULT_FROM_EMAIL = SERVER_EMAIL = _env_get('SERVER_EMAIL_SIGNATURE') + ' <%s>' % _env_get('SERVER_EMAIL')
 
 
 # Storage configurations
 # --------------------------------------------------------------------------
-USE_CLOUDFRONT= env.bool('USE_CLOUDFRONT', default=False)
-AWS_STORAGE_BUCKET_NAME = env('AWS_STORAGE_BUCKET_NAME')
-AWS_ACCESS_KEY_ID = env('AWS_ACCESS_KEY_ID')
-AWS_SECRET_ACCESS_KEY = env('AWS_SECRET_ACCESS_KEY')
+USE_CLOUDFRONT = _env_get('USE_CLOUDFRONT', False, _to_bool)
+AWS_STORAGE_BUCKET_NAME = _env_get('AWS_STORAGE_BUCKET_NAME')
+AWS_ACCESS_KEY_ID = _env_get('AWS_ACCESS_KEY_ID')
+AWS_SECRET_ACCESS_KEY = _env_get('AWS_SECRET_ACCESS_KEY')
 AWS_AUTO_CREATE_BUCKET = True
 AWS_DEFAULT_ACL = 'public-read'
 AWS_QUERYSTRING_AUTH = False
 AWS_S3_SECURE_URLS = True
-AWS_S3_ENDPOINT_URL = env('AWS_S3_ENDPOINT_URL') 
+AWS_S3_ENDPOINT_URL = _env_get('AWS_S3_ENDPOINT_URL')
 
 if USE_CLOUDFRONT:
-    AWS_S3_CUSTOM_DOMAIN = env('AWS_S3_CUSTOM_DOMAIN')
+    AWS_S3_CUSTOM_DOMAIN = _env_get('AWS_S3_CUSTOM_DOMAIN')
 else:
     AWS_S3_CUSTOM_DOMAIN = '{}.s3.amazonaws.com'.format(AWS_STORAGE_BUCKET_NAME)
 
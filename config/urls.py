@@ -1,101 +1,94 @@
-from rest_framework import permissions
-from rest_framework.permissions import AllowAny
+import json
+from functools import lru_cache
+
 from django.contrib import admin
 from django.urls import path, include, re_path
 from django.conf import settings
 from django.conf.urls.static import static
 from django.contrib.auth.decorators import login_required
 from django.shortcuts import redirect
-from django.http import JsonResponse
+from django.http import HttpResponse
 from django.views.decorators.csrf import csrf_exempt
 
 
-from drf_yasg import openapi  # type: ignore
-from drf_yasg.views import get_schema_view  # type: ignore
-from rest_framework_simplejwt.authentication import JWTAuthentication  # type: ignore
+_API_PATTERNS = [
+    # path('registration/', include('freelancing.registrations.api_urls')),
+    path('custom_auth/', include('freelancing.custom_auth.api_urls')),
+    path('voucher/', include('freelancing.voucher.api_urls')),
+]
+
+_HEALTH_BODY = json.dumps({'status': 'healthy', 'message': 'Django application is running'}).encode()
+
+
+@csrf_exempt
+def health_check(request):
+    return HttpResponse(_HEALTH_BODY, content_type='application/json')
+
+
+@csrf_exempt
+def cors_test(request):
+    body = json.dumps({'cors': 'working', 'origin': request.META.get('HTTP_ORIGIN', 'unknown')})
+    return HttpResponse(body, content_type='application/json')
+
 
 # For swagger
-schema_view = get_schema_view(
-    openapi.Info(
-        title="Bartr API",
-        default_version='v1',
-        description="""
-        # 🚀 Bartr - Complete Voucher Management Platform API
-        
-        ## Overview
-        Bartr is a comprehensive voucher management platform that enables merchants to create and manage vouchers, 
-        users to discover and purchase vouchers, and provides gift card sharing via WhatsApp with multi-user claiming.
-        
-        ## Key Features
-        - **Voucher Management**: Complete CRUD operations for merchants
-        - **Gift Card Sharing**: WhatsApp integration with multi-user claiming
-        - **Wallet Integration**: Point-based voucher purchases
-        - **Merchant Scanning**: QR code-based voucher redemption
-        - **Location-based Advertising**: City/state targeting for promotions
-        - **WhatsApp Contact Management**: Bulk contact validation and synchronization
-        
-        ## Authentication
-        All API endpoints require JWT token authentication. Include the token in the Authorization header:
-        ```
-        Authorization: Bearer <your_jwt_token>
-        ```
-        
-        ## Base URLs
-        - **Production**: https://bartrlatest-8l446.sevalla.app/api/
-        - **Development**: http://localhost:8000/api/
-        
-        ## API Categories
-        1. **Authentication & User Management** - User registration, login, profile management
-        2. **Merchant Management** - Merchant profiles, business information
-        3. **Voucher System** - Voucher creation, management, and analytics
-        4. **Wallet & Payments** - Point management, Razorpay integration
-        5. **Gift Card Sharing** - WhatsApp integration, multi-user claiming
-        6. **Advertisement Management** - Location-based promotion
-        7. **Merchant Scanning** - Voucher redemption workflow
-        
-        ## Getting Started
-        1. Authenticate using `/api/custom_auth/v1/auth/classic/`
-        2. Use the returned JWT token for subsequent requests
-        3. Explore the API endpoints below
-        
-        For detailed documentation, visit: [API_README.md](https://github.com/your-repo/API_README.md)
-        """,
-        terms_of_service="https://bartr.club/terms/",
-        contact=openapi.Contact(
-            name="Bartr Support",
-            email="support@bartr.club",
-            url="https://bartr.club"
-        ),
-        license=openapi.License(
-            name="Commercial License",
-            url="https://bartr.club/license/"
-        ),
-    ),
-    public=True,
-    permission_classes=(permissions.AllowAny,),
-    patterns=[
-        path('api/', include([
-            path('custom_auth/', include('freelancing.custom_auth.api_urls')),
-            path('voucher/', include('freelancing.voucher.api_urls')),
-        ])),
-    ],
-)
+# drf_yasg and its inspectors are only imported on the first documentation hit,
+# so management commands and worker boot don't pay for building the schema view.
+_schema_view = None
+
+
+def _get_schema_view():
+    global _schema_view
+    if _schema_view is None:
+        from rest_framework import permissions
+        from drf_yasg.views import get_schema_view  # type: ignore
+
+        from config.swagger import API_INFO
+
+        _schema_view = get_schema_view(
+            API_INFO,
+            public=True,
+            permission_classes=(permissions.AllowAny,),
+            patterns=[
+                path('api/', include(_API_PATTERNS)),
+            ],
+        )
+    return _schema_view
+
+
+@lru_cache(maxsize=None)
+def _schema_ui(renderer):
+    if renderer is None:
+        return _get_schema_view().without_ui(cache_timeout=0)
+    return _get_schema_view().with_ui(renderer, cache_timeout=0)
+
+
+@login_required
+def schema_swagger_ui(request, *args, **kwargs):
+    return _schema_ui('swagger')(request, *args, **kwargs)
+
+
+@login_required
+def schema_redoc(request, *args, **kwargs):
+    return _schema_ui('redoc')(request, *args, **kwargs)
+
+
+@login_required
+def schema_json(request, *args, **kwargs):
+    return _schema_ui(None)(request, *args, **kwargs)
+
 
 urlpatterns = [
     path('admin/', admin.site.urls),
-    path('health/', csrf_exempt(lambda request: JsonResponse({'status': 'healthy', 'message': 'Django application is running'})), name='health-check'),
-    path('cors-test/', csrf_exempt(lambda request: JsonResponse({'cors': 'working', 'origin': request.META.get('HTTP_ORIGIN', 'unknown')})), name='cors-test'),
+    path('health/', health_check, name='health-check'),
+    path('cors-test/', cors_test, name='cors-test'),
     # Swagger Documentation URLs
-    path('swagger/', login_required(schema_view.with_ui('swagger', cache_timeout=0)), name='schema-swagger-ui'),
-    path('redoc/', login_required(schema_view.with_ui('redoc', cache_timeout=0)), name='schema-redoc'),
-    path('swagger.json', login_required(schema_view.without_ui(cache_timeout=0)), name='schema-json'),
+    path('swagger/', schema_swagger_ui, name='schema-swagger-ui'),
+    path('redoc/', schema_redoc, name='schema-redoc'),
+    path('swagger.json', schema_json, name='schema-json'),
     path('accounts/login/', lambda request: redirect(f'/admin/login/?next=/swagger/')),  # Redirect to admin login with next parameter
     path('accounts/', include('django.contrib.auth.urls')),
-    path('api/', include([
-        # path('registration/', include('freelancing.registrations.api_urls')),
-        path('custom_auth/', include('freelancing.custom_auth.api_urls')),
-        path('voucher/', include('freelancing.voucher.api_urls')),
-    ])),
+    path('api/', include(_API_PATTERNS)),
     path('i18n/', include('django.conf.urls.i18n')),  # Enable language switching
 ]
 
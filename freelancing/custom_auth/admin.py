@@ -1,13 +1,20 @@
+from datetime import timedelta
+from functools import lru_cache
+
 from django.contrib import admin
-from django.db.models import BooleanField, Case, Value, When, Count, Sum, Avg
-from django.utils.html import format_html
+from django.contrib.auth import get_user_model
+from django.contrib.auth.admin import UserAdmin
+from django.db import transaction
+from django.db.models import (BooleanField, CharField, Count, F, Max, Q, Value,
+                              ExpressionWrapper, FloatField)
+from django.utils import timezone
+from django.utils.html import escape
 from django.urls import reverse
 from django.utils.safestring import mark_safe
-from django.db.models.functions import TruncDate
+from django.db.models.functions import Cast, Coalesce, Concat, NullIf
 
-from freelancing.custom_auth.models import (ApplicationUser, MultiToken,
-                                            UserActivity, CustomPermission,
-                                            MerchantProfile, Wallet, Category, WalletHistory, SiteSetting, RazorpayTransaction)
+from freelancing.custom_auth.models import (MultiToken, MerchantProfile, Wallet, Category,
+                                            WalletHistory, SiteSetting, RazorpayTransaction)
 from freelancing.voucher.models import Voucher
 
 # Custom Admin Site Configuration
@@ -30,13 +37,27 @@ admin.site.index_title = "Welcome to Bartr Administration"
 # admin.site.register(SiteSetting)
 # admin.site.register(RazorpayTransaction)
 
-from datetime import timedelta
+User = get_user_model()
 
-from django.contrib.auth import get_user_model
-from django.contrib.auth.admin import UserAdmin
-from django.utils import timezone
+# Pre-built markup for admin columns; only the URL/value is escaped per row.
+_CATEGORY_IMAGE_TPL = '<img src="%s" style="max-height: 50px; max-width: 50px;" />'
+_LOGO_PREVIEW_TPL = '<img src="%s" style="max-height: 100px; max-width: 100px;" />'
+_BANNER_PREVIEW_TPL = '<img src="%s" style="max-height: 100px; max-width: 200px;" />'
+_WALLET_LINK_TPL = '<a href="%s">View Wallet (₹%s)</a>'
+_PROFILE_LINK_TPL = '<a href="%s">View Profile</a>'
+_VOUCHERS_LINK_TPL = '<a href="%s?merchant__id__exact=%s">View all vouchers (%s)</a>'
 
-User = get_user_model()
+
+@lru_cache
+def _admin_url_parts(viewname):
+    """Resolve an admin change URL once and return its (prefix, suffix) around the pk."""
+    prefix, _, suffix = reverse(viewname, args=[0]).rpartition('0')
+    return prefix, suffix
+
+
+def _admin_change_url(viewname, pk):
+    prefix, suffix = _admin_url_parts(viewname)
+    return f"{prefix}{pk}{suffix}"
 
 
 @admin.register(MultiToken)
@@ -56,6 +77,7 @@ class MultiTokenAdmin(admin.ModelAdmin):
     list_display = ("user", "key", "created")
     readonly_fields = ("user", "key", "created")
     search_fields = ("user__email", "user__fullname")
+    list_select_related = ("user",)
 
 
 class VoucherInline(admin.TabularInline):
@@ -64,10 +86,37 @@ class VoucherInline(admin.TabularInline):
     readonly_fields = ('uuid', 'purchase_count', 'redemption_count', 'redemption_rate')
     fields = ('title', 'voucher_type', 'is_active', 'is_gift_card', 'purchase_count', 'redemption_count', 'redemption_rate')
     can_delete = False
+    # Only the newest vouchers are rendered as forms; the rest are reached via vouchers_link.
+    _RECENT_LIMIT = 25
    
     def redemption_rate(self, obj):
-        return f"{obj.get_redemption_rate()}%"
+        return f"{round(obj._redemption_rate or 0.0, 2)}%"
     redemption_rate.short_description = 'Redemption Rate'
+   
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request).annotate(
+            _redemption_rate=ExpressionWrapper(
+                Cast('redemption_count', FloatField()) * 100.0 / NullIf('purchase_count', 0),
+                output_field=FloatField(),
+            )
+        )
+        object_id = request.resolver_match.kwargs.get('object_id') if request.resolver_match else None
+        if object_id:
+            recent = (
+                Voucher.objects.filter(merchant_id=object_id)
+                .order_by('-create_time')
+                .values('pk')[:self._RECENT_LIMIT]
+            )
+            queryset = queryset.filter(pk__in=recent)
+        return queryset
+   
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        formfield = super().formfield_for_foreignkey(db_field, request, **kwargs)
+        if db_field.name == 'voucher_type':
+            # The formset's form class is built once per request and every inline row
+            # deep-copies this field, so a static list of choices is queried only once.
+            formfield.choices = list(formfield.choices)
+        return formfield
 
 
 @admin.register(Category)
@@ -76,20 +125,29 @@ class CategoryAdmin(admin.ModelAdmin):
     list_filter = ('is_active', 'create_time')
     search_fields = ('name', 'description')
     readonly_fields = ('merchant_count', 'voucher_count')
+    show_full_result_count = False
    
     def image_preview(self, obj):
         if obj.image:
-            return format_html('<img src="{}" style="max-height: 50px; max-width: 50px;" />', obj.image.url)
+            return mark_safe(_CATEGORY_IMAGE_TPL % escape(obj.image.url))
         return "No Image"
     image_preview.short_description = 'Image'
    
     def merchant_count(self, obj):
-        return obj.merchants.count()
+        return obj._merchant_count
     merchant_count.short_description = 'Merchants'
+    merchant_count.admin_order_field = '_merchant_count'
    
     def voucher_count(self, obj):
-        return obj.vouchers.count()
+        return obj._voucher_count
     voucher_count.short_description = 'Vouchers'
+    voucher_count.admin_order_field = '_voucher_count'
+   
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(
+            _merchant_count=Count('merchants', distinct=True),
+            _voucher_count=Count('vouchers', distinct=True),
+        )
 
 
 @admin.register(MerchantProfile)
@@ -97,7 +155,8 @@ class MerchantProfileAdmin(admin.ModelAdmin):
     list_display = ('business_name', 'user', 'category', 'email', 'phone', 'city', 'state', 'voucher_count', 'is_active')
     list_filter = ('category', 'is_active', 'create_time', 'city', 'state')
     search_fields = ('business_name', 'user__email', 'user__fullname', 'gst_number', 'fssai_number')
-    readonly_fields = ('voucher_count', 'logo_preview', 'banner_preview')
+    readonly_fields = ('voucher_count', 'vouchers_link', 'logo_preview', 'banner_preview')
+    autocomplete_fields = ('user',)
     actions = ['activate_merchants', 'deactivate_merchants']
     inlines = [VoucherInline]
     fieldsets = (
@@ -116,6 +175,9 @@ class MerchantProfileAdmin(admin.ModelAdmin):
         ('Media', {
             'fields': ('logo', 'logo_preview', 'banner_image', 'banner_preview')
         }),
+        ('Vouchers', {
+            'fields': ('voucher_count', 'vouchers_link')
+        }),
         ('Status', {
             'fields': ('is_active', 'is_delete')
         })
@@ -123,27 +185,50 @@ class MerchantProfileAdmin(admin.ModelAdmin):
    
     def logo_preview(self, obj):
         if obj.logo:
-            return format_html('<img src="{}" style="max-height: 100px; max-width: 100px;" />', obj.logo.url)
+            return mark_safe(_LOGO_PREVIEW_TPL % escape(obj.logo.url))
         return "No Logo"
     logo_preview.short_description = 'Logo Preview'
    
     def banner_preview(self, obj):
         if obj.banner_image:
-            return format_html('<img src="{}" style="max-height: 100px; max-width: 200px;" />', obj.banner_image.url)
+            return mark_safe(_BANNER_PREVIEW_TPL % escape(obj.banner_image.url))
         return "No Banner"
     banner_preview.short_description = 'Banner Preview'
    
     def voucher_count(self, obj):
-        return obj.vouchers.count()
+        return obj._voucher_count
     voucher_count.short_description = 'Vouchers'
+    voucher_count.admin_order_field = '_voucher_count'
+   
+    def vouchers_link(self, obj):
+        if obj.pk is None:
+            return "-"
+        url = reverse('admin:voucher_voucher_changelist')
+        return mark_safe(_VOUCHERS_LINK_TPL % (escape(url), obj.pk, obj._voucher_count))
+    vouchers_link.short_description = 'All Vouchers'
+   
+    def get_queryset(self, request):
+        return (
+            super()
+            .get_queryset(request)
+            .select_related('user', 'category')
+            .annotate(_voucher_count=Count('vouchers'))
+        )
    
     def activate_merchants(self, request, queryset):
-        updated = queryset.update(is_active=True)
+        updated = queryset.update(is_active=True, update_time=timezone.now())
         self.message_user(request, f"Successfully activated {updated} merchants.")
     activate_merchants.short_description = "Activate selected merchants"
    
     def deactivate_merchants(self, request, queryset):
-        updated = queryset.update(is_active=False)
+        # Pull the merchants' vouchers in the same commit so none stay purchasable.
+        # The ids are fixed up front: on a changelist filtered by is_active, re-evaluating
+        # the queryset after the first UPDATE would no longer match the merchants.
+        ids = list(queryset.values_list('pk', flat=True))
+        now = timezone.now()
+        with transaction.atomic():
+            updated = MerchantProfile.objects.filter(pk__in=ids).update(is_active=False, update_time=now)
+            Voucher.objects.filter(merchant_id__in=ids).update(is_active=False, update_time=now)
         self.message_user(request, f"Successfully deactivated {updated} merchants.")
     deactivate_merchants.short_description = "Deactivate selected merchants"
 
@@ -154,15 +239,23 @@ class WalletAdmin(admin.ModelAdmin):
     list_filter = ('is_active', 'create_time')
     search_fields = ('user__email', 'user__fullname')
     readonly_fields = ('transaction_count', 'last_transaction_date')
+    autocomplete_fields = ('user',)
    
     def transaction_count(self, obj):
-        return obj.histories.count()
+        return obj._transaction_count
     transaction_count.short_description = 'Transactions'
+    transaction_count.admin_order_field = '_transaction_count'
    
     def last_transaction_date(self, obj):
-        last_transaction = obj.histories.order_by('-create_time').first()
-        return last_transaction.create_time if last_transaction else "No transactions"
+        return obj._last_transaction_date or "No transactions"
     last_transaction_date.short_description = 'Last Transaction'
+    last_transaction_date.admin_order_field = '_last_transaction_date'
+   
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('user').annotate(
+            _transaction_count=Count('histories'),
+            _last_transaction_date=Max('histories__create_time'),
+        )
 
 
 @admin.register(WalletHistory)
@@ -172,6 +265,10 @@ class WalletHistoryAdmin(admin.ModelAdmin):
     search_fields = ('wallet__user__email', 'wallet__user__fullname', 'reference_note', 'reference_id')
     readonly_fields = ()
     date_hierarchy = 'create_time'
+    autocomplete_fields = ('wallet',)
+   
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('wallet__user')
 
 
 @admin.register(RazorpayTransaction)
@@ -180,6 +277,8 @@ class RazorpayTransactionAdmin(admin.ModelAdmin):
     list_filter = ('status', 'currency', 'create_time')
     search_fields = ('razorpay_order_id', 'razorpay_payment_id', 'user__email', 'user__fullname')
     readonly_fields = ('razorpay_order_id',)
+    list_select_related = ('user',)
+    autocomplete_fields = ('user', 'wallet')
     fieldsets = (
         ('Transaction Details', {
             'fields': ('user', 'wallet', 'razorpay_order_id', 'razorpay_payment_id', 'razorpay_signature')
@@ -204,6 +303,7 @@ class SiteSettingAdmin(admin.ModelAdmin):
     list_filter = ('is_active', 'create_time')
     search_fields = ('key', 'value')
     readonly_fields = ()
+    show_full_result_count = False
 
 
 @admin.register(User)
@@ -319,67 +419,84 @@ class UserAdmin(UserAdmin):
     )
     search_fields = ("username", "email", "uuid", "fullname", "phone")
     filter_horizontal = ("groups", "user_permissions")
+    _IS_ONLINE_THRESHOLD = timedelta(minutes=5)
+    # Columns no list_display entry reads; the changelist leaves them out of its SELECT.
+    _CHANGELIST_DEFERRED = (
+        "password",
+        "readable_password",
+        "address",
+        "area",
+        "pin",
+        "city",
+        "state",
+        "photo",
+        "device_type",
+        "device_token",
+    )
 
     def _get_password(self, obj):
-        return "Yes" if obj.password not in [None, ""] else "No"
+        return "Yes" if obj._has_password else "No"
 
     _get_password.short_description = "PASSWORD"
-    _get_password.admin_order_field = "password"
+    _get_password.admin_order_field = "_has_password"
    
     def wallet_link(self, obj):
-        try:
-            wallet = obj.wallet
-            url = reverse('admin:custom_auth_wallet_change', args=[wallet.id])
-            return format_html('<a href="{}">View Wallet (₹{})</a>', url, wallet.balance)
-        except:
+        # get_queryset joins the wallet, so a missing one is cached as None and raises
+        # RelatedObjectDoesNotExist (an AttributeError) without another query.
+        wallet = getattr(obj, 'wallet', None)
+        if wallet is None:
             return "No Wallet"
+        url = _admin_change_url('admin:custom_auth_wallet_change', wallet.id)
+        return mark_safe(_WALLET_LINK_TPL % (escape(url), escape(wallet.balance)))
     wallet_link.short_description = "Wallet"
    
     def merchant_profile_link(self, obj):
-        if obj.is_merchant:
-            try:
-                profile = obj.merchant_profile
-                url = reverse('admin:custom_auth_merchantprofile_change', args=[profile.id])
-                return format_html('<a href="{}">View Profile</a>', url)
-            except:
-                return "No Profile"
-        return "Not a Merchant"
+        if not obj.is_merchant:
+            return "Not a Merchant"
+        profile = getattr(obj, 'merchant_profile', None)
+        if profile is None:
+            return "No Profile"
+        url = _admin_change_url('admin:custom_auth_merchantprofile_change', profile.id)
+        return mark_safe(_PROFILE_LINK_TPL % escape(url))
     merchant_profile_link.short_description = "Merchant Profile"
    
     def wallet_balance(self, obj):
-        try:
-            return f"₹{obj.wallet.balance}"
-        except:
-            return "₹0.00"
+        return obj._wallet_balance_display
     wallet_balance.short_description = "Wallet Balance"
+    wallet_balance.admin_order_field = "_wallet_balance"
 
-    def get_search_results(self, request, queryset, search_term):
-        queryset, use_distinct = super().get_search_results(
-            request, queryset, search_term
-        )
-        if search_term != "":
-            queryset |= self.model.objects.filter(phone=search_term)
-
-        return queryset, use_distinct
+    def formfield_for_manytomany(self, db_field, request=None, **kwargs):
+        if db_field.name == "user_permissions":
+            qs = kwargs.get("queryset", db_field.remote_field.model.objects)
+            # Permission.__str__ reads content_type; join it instead of one query per option.
+            kwargs["queryset"] = qs.select_related("content_type")
+        return super().formfield_for_manytomany(db_field, request=request, **kwargs)
 
     def get_queryset(self, request):
-        return (
+        queryset = (
             super()
             .get_queryset(request)
-            .annotate(
-                is_online=Case(
-                    When(
-                        last_user_activity__gte=timezone.now() - timedelta(minutes=5),
-                        then=Value(True),
-                    ),
-                    default=Value(False),
-                    output_field=BooleanField(),
-                )
-            )
+            .select_related("wallet", "merchant_profile")
+            .annotate(_wallet_balance=F("wallet__balance"))
         )
+        # _has_password/_wallet_balance_display only back changelist columns; change forms skip them.
+        match = request.resolver_match
+        if match and match.url_name and match.url_name.endswith("_changelist"):
+            queryset = queryset.annotate(
+                _has_password=ExpressionWrapper(~Q(password=""), output_field=BooleanField()),
+                # CONCAT() skips NULL arguments on Postgres, so the fallback goes inside it
+                _wallet_balance_display=Concat(
+                    Value("₹"),
+                    Coalesce(Cast("wallet__balance", CharField()), Value("0.00")),
+                    output_field=CharField(),
+                ),
+            ).defer(*self._CHANGELIST_DEFERRED)
+        return queryset
 
     def is_online(self, obj):
-        return obj.is_online
+        last_seen = obj.last_user_activity
+        return last_seen is not None and last_seen >= timezone.now() - self._IS_ONLINE_THRESHOLD
 
     is_online.boolean = True
-    is_online.admin_order_field = "is_online"
+    # Sorting by the raw timestamp puts online users first and can use user_last_activity_idx.
+    is_online.admin_order_field = "last_user_activity"
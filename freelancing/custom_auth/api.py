@@ -1,8 +1,10 @@
-import random
-import razorpay
+import math
+from razorpay.errors import BadRequestError, GatewayError, ServerError
+from requests.exceptions import RequestException, Timeout
+from kombu.exceptions import OperationalError as BrokerError
 import hashlib
 import hmac
-import uuid
+import time
 from typing import Type
 from decimal import Decimal
 
@@ -13,6 +15,7 @@ from django.contrib.auth import authenticate, get_user_model
 from django.contrib.sites.shortcuts import get_current_site
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
+from django.utils.http import parse_etags
 from django.utils.translation import gettext as _
 from django.contrib.contenttypes.models import ContentType
 from django_filters.rest_framework import DjangoFilterBackend
@@ -35,7 +38,12 @@ from templated_email import send_templated_mail
 from freelancing.custom_auth.models import (ApplicationUser, LoginOtp, CustomBlacklistedToken,
                                          CustomPermission, Wallet, MerchantProfile, Category,
                                         WalletHistory, RazorpayTransaction)
+from freelancing.custom_auth.filter import RazorpayTransactionFilter, WalletHistoryFilter
+from freelancing.custom_auth.payments import (RAZORPAY_TIMEOUT, RAZORPAY_VERIFY_FIELDS,
+                                              credit_captured_payment, razorpay_client,
+                                              razorpay_secret)
 from freelancing.custom_auth.permissions import IsSelf
+from freelancing.custom_auth.tasks import confirm_razorpay_payment
 from freelancing.custom_auth.serializers import (BaseUserSerializer,
                                                 ChangePasswordSerializer,
                                                 PasswordValidationSerializer,
@@ -46,25 +54,28 @@ from freelancing.custom_auth.serializers import (BaseUserSerializer,
                                                 UserPasswordResetSerializer, MerchantProfileSerializer, WalletSerializer,
                                                 CategorySerializer, WalletHistorySerializer, MerchantListingSerializer,
                                                 RazorpayOrderSerializer, RazorpayPaymentVerificationSerializer,
-                                                RazorpayTransactionSerializer
+                                                RazorpayTransactionSerializer, RazorpayTransactionListSerializer
                                             )
 # from trade_time_accounting.notification.FCM_manager import unsubscribe_from_topic
 from freelancing.registrations.serializers import CheckOtp
+from freelancing.utils.functions import generateOtp
 from freelancing.utils.permissions import  IsReadAction, IsSuperAdminUser
+from freelancing.utils.renderer import ORJSONRenderer
 from freelancing.utils.serializers import add_serializer_mixin
+from freelancing.voucher.models import Voucher
 
-from django.db.models import F, FloatField, ExpressionWrapper, Count
-from django.db.models.functions import ACos, Cos, Radians, Sin
+from django.db.models import F, FloatField, Func, Value, Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 from drf_yasg.utils import swagger_auto_schema
 
-from rest_framework_simplejwt.authentication import JWTAuthentication # type: ignore
+from freelancing.custom_auth.auth_backends.authentication import CachedJWTAuthentication
 User = get_user_model()
 
 
 class UserAuthViewSet(viewsets.ViewSet):
     NEW_TOKEN_HEADER = "X-Token"
     permission_classes = (permissions.IsAuthenticated,)
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [CachedJWTAuthentication]
     
     @classmethod
     def get_success_headers(cls, user):
@@ -94,52 +105,39 @@ class UserAuthViewSet(viewsets.ViewSet):
             if not user:
                 user = User.objects.create(phone=user_mobile)
             # Send SMS code
-            # otp = random.randint(1000, 9999)
+            # otp = generateOtp()
             # LoginOtp.objects.update_or_create(user_mobile=user_mobile, defaults={'otp': otp})
-
-            user_details = BaseUserSerializer(
-                instance=user, context={"request": request, "view": self}
-            ).data
-
-            refresh = RefreshToken.for_user(user)
-            access_token = str(refresh.access_token)
-            refresh_token = str(refresh)
-
-            user_details['access_token'] = access_token
-            user_details['refresh_token'] = refresh_token
-
-            # logout previous login
-            # token = Token.objects.filter(user_id=user.id)
-            # if token.exists() and token.count() > 1:
-            #     user.user_auth_tokens.first().delete()
-
-            return Response({'message': 'Login Successful', 'data': user_details, 'success': 'true'},
-                            status=status.HTTP_200_OK)
         
         else:
             user = authenticate(request, **auth_serializer.data)
             if not user:
                 raise ValidationError("Invalid credentials")
-
-            user_details = BaseUserSerializer(
-                instance=user, context={"request": request, "view": self}
-            ).data
             # user_details.update(self.get_success_headers(user))
-            # Generate JWT token
-            refresh = RefreshToken.for_user(user)
-            access_token = str(refresh.access_token)
-            refresh_token = str(refresh)
 
-            user_details['access_token'] = access_token
-            user_details['refresh_token'] = refresh_token
+        # logout previous login
+        # token = Token.objects.filter(user_id=user.id)
+        # if token.exists() and token.count() > 1:
+        #     user.user_auth_tokens.first().delete()
 
-            # logout previous login
-            # token = Token.objects.filter(user_id=user.id)
-            # if token.exists() and token.count() > 1:
-            #     user.user_auth_tokens.first().delete()
+        return Response({'message': 'Login Successful', 'data': self._issue_tokens(request, user), 'success': 'true'},
+                        status=status.HTTP_200_OK)
+
+    def _issue_tokens(self, request, user):
+        """
+            Serialize the user and attach a freshly minted JWT access/refresh pair
+            :param request:
+            :param user:
+            :return: user details with access_token and refresh_token
+        """
+        user_details = BaseUserSerializer(
+            instance=user, context={"request": request, "view": self}
+        ).data
+
+        refresh = RefreshToken.for_user(user)
+        user_details['access_token'] = str(refresh.access_token)
+        user_details['refresh_token'] = str(refresh)
+        return user_details
 
-            return Response({'message': 'Login Successful', 'data': user_details, 'success': 'true'},
-                            status=status.HTTP_200_OK)
     @swagger_auto_schema(
         method="post",
         request_body=UserAuthSerializer,  # 👈 force swagger to show body schema
@@ -198,7 +196,7 @@ class UserViewSet(viewsets.ModelViewSet):
         permissions.IsAuthenticated
         # IsReadAction | IsSelf,
     ]
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [CachedJWTAuthentication]
     # lookup_field = "uuid"
     filter_backends = (DjangoFilterBackend, SearchFilter)
     search_fields = ["fullname"]
@@ -256,6 +254,13 @@ class UserViewSet(viewsets.ModelViewSet):
     #     return User.objects.filter(user=user)
     def get_queryset(self):
         queryset = super().get_queryset()
+        if self.action == "list":
+            # Only the columns BaseUserSerializer renders (photo needs its dimension fields)
+            queryset = queryset.only(
+                "id", "uuid", "phone", "fullname", "first_name", "last_name", "email",
+                "photo", "width_photo", "height_photo", "gender", "is_merchant", "merchant_id",
+                "address", "area", "pin", "city", "state", "is_active",
+            )
         return queryset
 
     @action(
@@ -345,7 +350,7 @@ class UserViewSet(viewsets.ModelViewSet):
     #     if user.user_type == "student" and user.login_type != "S":
     #         raise ValidationError(_("Please enter valid email id"))
 
-    #     otp = random.randint(1111, 9999)
+    #     otp = generateOtp()
 
     #     LoginOtp.objects.create(user=user, otp=otp)
     #     # forget_password_otp(user, otp)
@@ -462,7 +467,7 @@ class CustomPermissionViewSet(viewsets.ModelViewSet):
     queryset = CustomPermission.objects.all()
     serializer_class = CustomPermissionSerializer
     permission_classes = [permissions.IsAuthenticated]
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [CachedJWTAuthentication]
 
 
 
@@ -518,7 +523,7 @@ class MerchantProfileViewSet(viewsets.ModelViewSet):
     permission_classes = [
         permissions.IsAuthenticated,
     ]
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [CachedJWTAuthentication]
     filter_backends = (DjangoFilterBackend, SearchFilter)
     http_method_names = ['get', 'post']
     # search_fields = ["user__phone"]
@@ -580,7 +585,7 @@ class WalletViewSet(viewsets.ModelViewSet):
         permissions.IsAuthenticated,
     ]
     http_method_names = ['get']
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [CachedJWTAuthentication]
     filter_backends = (DjangoFilterBackend, SearchFilter)
 
     def get_queryset(self):
@@ -602,24 +607,27 @@ class WalletViewSet(viewsets.ModelViewSet):
     def destroy(self, request, *args, **kwargs):
         return Response({"detail": "Wallet cannot be deleted manually."}, status=status.HTTP_403_FORBIDDEN)
 
+
+# Columns read by WalletHistorySerializer
+_WALLET_HISTORY_FIELDS = ("id", "transaction_type", "amount", "reference_note", "reference_id", "meta", "create_time")
+
+
 class WalletHistoryListView(generics.ListAPIView):
     serializer_class = WalletHistorySerializer
     permission_classes = [permissions.IsAuthenticated]
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
-    filterset_fields = ["transaction_type", "reference_note", "reference_id"]
+    filterset_class = WalletHistoryFilter
     ordering_fields = ["create_time", "amount"]
     ordering = ["-create_time"]
+    renderer_classes = [ORJSONRenderer]
 
     def get_queryset(self):
         # Handle case where request.user might not be available (e.g., during Swagger inspection)
         if hasattr(self, 'request') and hasattr(self.request, 'user') and self.request.user.is_authenticated:
             user = self.request.user
-            wallet = Wallet.objects.filter(user=user).first()
-
-            if not wallet:
-                return WalletHistory.objects.none()
-
-            return wallet.histories.all()
+            # Filter through the wallet join instead of loading the wallet first;
+            # users without a wallet simply get an empty page.
+            return WalletHistory.objects.filter(wallet__user=user).only(*_WALLET_HISTORY_FIELDS)
         # Return empty queryset for unauthenticated requests or during inspection
         return WalletHistory.objects.none()
 
@@ -629,36 +637,110 @@ class WalletSummaryView(APIView):
     def get(self, request):
         # Use user's wallet (common wallet for both user and merchant)
         user = request.user
-        wallet = Wallet.objects.filter(user=user).first()
+        # Only the columns the ETag and response need, as a plain dict; histories are
+        # fetched after the 304 check
+        wallet = Wallet.objects.filter(user=user).values("id", "balance", "update_time").first()
 
         if not wallet:
             return Response({"balance": 0.0, "recent_transactions": []})
 
-        serializer = WalletHistorySerializer(wallet.histories.order_by("-create_time")[:5], many=True)
+        # credit()/deduct() update the wallet row before writing history, so its
+        # update_time and balance change whenever the summary would.
+        etag = '"%s"' % hashlib.blake2b(
+            f"{wallet['id']}:{wallet['update_time'].isoformat()}:{wallet['balance']}".encode(), digest_size=8
+        ).hexdigest()
+        # If-None-Match uses weak comparison, so a W/ prefix on the client's tag is ignored
+        if_none_match = parse_etags(request.headers.get("If-None-Match", ""))
+        if "*" in if_none_match or etag in (tag.removeprefix("W/") for tag in if_none_match):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+        # ModelSerializer fields read dict rows as well as instances, so the output is unchanged
+        recent = WalletHistory.objects.filter(wallet_id=wallet["id"]).order_by("-create_time").values(
+            *_WALLET_HISTORY_FIELDS
+        )[:5]
+        serializer = WalletHistorySerializer(recent, many=True)
         return Response({
-            "balance": wallet.balance,
+            "balance": wallet["balance"],
             "recent_transactions": serializer.data
-        })
+        }, headers={"ETag": etag})
+
+
+class HaversineDistance(Func):
+    """
+    Great-circle distance in km from a fixed point to a latitude/longitude column pair,
+    emitted as one SQL expression instead of a tree of ACos/Cos/Radians/Sin nodes.
+    The point's radians, cosine and sine are request constants, so they are computed
+    here once rather than per row in SQL.
+    """
+    output_field = FloatField()
+
+    def __init__(self, lat, lng, lat_field='latitude', lng_field='longitude'):
+        lat_r = math.radians(lat)
+        super().__init__(
+            Value(math.cos(lat_r)), Value(math.sin(lat_r)), Value(math.radians(lng)),
+            F(lat_field), F(lng_field),
+        )
+
+    def as_sql(self, compiler, connection, **extra_context):
+        (
+            (cos_lat, cos_lat_params), (sin_lat, sin_lat_params), (lng_r, lng_r_params),
+            (col_lat, col_lat_params), (col_lng, col_lng_params),
+        ) = (compiler.compile(expression) for expression in self.get_source_expressions())
+        # Clamped so rounding at zero distance cannot push ACOS out of its [-1, 1] domain
+        sql = (
+            f"6371 * ACOS(LEAST(1.0, GREATEST(-1.0, "
+            f"{cos_lat} * COS(RADIANS({col_lat})) * COS(RADIANS({col_lng}) - {lng_r}) + "
+            f"{sin_lat} * SIN(RADIANS({col_lat})))))"
+        )
+        params = (
+            *cos_lat_params, *col_lat_params, *col_lng_params, *lng_r_params,
+            *sin_lat_params, *col_lat_params,
+        )
+        return sql, params
+
+
+# Columns read by MerchantListingSerializer; of the joined user and category rows only
+# the displayed name/contact/image columns are loaded (not passwords, addresses, etc.)
+_MERCHANT_LISTING_FIELDS = (
+    "id", "user", "category", "business_name", "email", "phone", "gender", "gst_number",
+    "fssai_number", "address", "area", "pin", "city", "state", "latitude", "longitude",
+    "logo", "banner_image", "is_active", "create_time", "update_time",
+    "user__fullname", "user__email", "user__phone", "category__name", "category__image",
+)
 
 
 class MerchantListAPIView(ListAPIView):
     serializer_class = MerchantListingSerializer
     permission_classes = []
+    renderer_classes = [ORJSONRenderer]
 
     def get_queryset(self):
-        queryset = MerchantProfile.objects.filter(user__is_active=True)
-
-        # Annotate with available vouchers count
+        # The listing serializer reads user and category fields on every row
+        queryset = MerchantProfile.objects.filter(user__is_active=True).select_related(
+            'user', 'category'
+        ).only(*_MERCHANT_LISTING_FIELDS)
+
+        # Annotate with available vouchers count. A correlated subquery (rather than a
+        # grouped JOIN) keeps the paginator's COUNT(*) free of the vouchers table,
+        # since Django drops unreferenced non-aggregate annotations when counting.
+        available_vouchers = (
+            Voucher.objects.filter(
+                merchant=OuterRef('pk'),
+                is_active=True,
+                is_gift_card=False,
+            )
+            .filter(
+                Q(count__isnull=True) |  # No limit
+                Q(redemption_count__lt=F('count'))  # Still has available redemptions
+            )
+            .order_by()
+            .values('merchant')
+            .annotate(total=Count('pk'))
+            .values('total')
+        )
         queryset = queryset.annotate(
-            available_vouchers_count=Count(
-                'vouchers',
-                filter=Q(
-                    vouchers__is_active=True,
-                    vouchers__is_gift_card=False
-                ) & (
-                    Q(vouchers__count__isnull=True) |  # No limit
-                    Q(vouchers__redemption_count__lt=F('vouchers__count'))  # Still has available redemptions
-                )
+            available_vouchers_count=Coalesce(
+                Subquery(available_vouchers, output_field=IntegerField()), 0
             )
         )
 
@@ -696,6 +778,17 @@ class MerchantListAPIView(ListAPIView):
         user_lat = self.request.query_params.get('latitude')
         user_lng = self.request.query_params.get('longitude')
 
+        # Optional search radius in km. Parsed on its own so a bad value only drops the
+        # radius filter, not the distance ordering; anything but a finite positive number
+        # (e.g. "abc", "-5", "nan", "inf") is ignored.
+        radius = self.request.query_params.get('radius')
+        try:
+            radius = float(radius) if radius else None
+        except ValueError:
+            radius = None
+        if radius is not None and not (math.isfinite(radius) and radius > 0):
+            radius = None
+
         if user_lat and user_lng:
             try:
                 user_lat = float(user_lat)
@@ -704,18 +797,22 @@ class MerchantListAPIView(ListAPIView):
                 # Ignore merchants without valid lat/lng
                 queryset = queryset.filter(latitude__isnull=False, longitude__isnull=False)
 
-                # Haversine Formula
-                distance_expr = 6371 * ACos(
-                    Cos(Radians(user_lat)) *
-                    Cos(Radians(F('latitude'))) *
-                    Cos(Radians(F('longitude')) - Radians(user_lng)) +
-                    Sin(Radians(user_lat)) *
-                    Sin(Radians(F('latitude')))
-                )
+                # Narrow to a bounding box first so the lat/lng index does the scan
+                # and the trig below only runs on nearby rows
+                if radius:
+                    lat_delta = radius / 111.0
+                    lng_delta = radius / max(111.0 * math.cos(math.radians(user_lat)), 0.01)
+                    queryset = queryset.filter(
+                        latitude__range=(user_lat - lat_delta, user_lat + lat_delta),
+                        longitude__range=(user_lng - lng_delta, user_lng + lng_delta),
+                    )
 
+                # Haversine Formula
                 queryset = queryset.annotate(
-                    distance=ExpressionWrapper(distance_expr, output_field=FloatField())
+                    distance=HaversineDistance(user_lat, user_lng)
                 ).order_by('distance')
+                if radius:
+                    queryset = queryset.filter(distance__lte=radius)
 
             except (ValueError, TypeError):
                 # If conversion fails, just skip distance logic
@@ -723,26 +820,11 @@ class MerchantListAPIView(ListAPIView):
 
         return queryset
 
-    def get_serializer_context(self):
-        context = super().get_serializer_context()
-        context['request'] = self.request
-        return context
-
-    def get_serializer_context(self):
-        context = super().get_serializer_context()
-        context['request'] = self.request
-        return context
-
 
 class RazorpayWalletAPIView(APIView):
     """API for Razorpay wallet operations"""
     permission_classes = [permissions.IsAuthenticated]
-    authentication_classes = [JWTAuthentication]
-
-    def __init__(self, **kwargs):
-        super().__init__(**kwargs)
-        # Initialize Razorpay client
-        self.client = razorpay.Client(auth=(settings.RAZORPAY_KEY_ID, settings.RAZORPAY_KEY_SECRET))
+    authentication_classes = [CachedJWTAuthentication]
 
     def post(self, request):
         """Create Razorpay order for adding points to wallet"""
@@ -752,16 +834,21 @@ class RazorpayWalletAPIView(APIView):
         user = request.user
         amount = serializer.validated_data['amount']
         
-        # Get or create wallet for user
-        wallet, created = Wallet.objects.get_or_create(user=user)
+        # The post_save signal gives every user a wallet; only its id is needed here.
+        # get_or_create stays as the fallback for accounts that predate the signal.
+        wallet = Wallet.objects.only('id').filter(user=user).first()
+        if wallet is None:
+            wallet, created = Wallet.objects.get_or_create(user=user)
         
         # Create Razorpay order
+        user_id = str(user.id)
         order_data = {
             'amount': int(amount * 100),  # Convert to paise
             'currency': serializer.validated_data.get('currency', 'INR'),
-            'receipt': f'wallet_recharge_{user.id}_{int(timezone.now().timestamp())}',
+            # Epoch seconds straight from the clock; no tz-aware datetime needed
+            'receipt': f'wallet_recharge_{user_id}_{int(time.time())}',
             'notes': {
-                'user_id': str(user.id),
+                'user_id': user_id,
                 'wallet_id': str(wallet.id),
                 'type': 'wallet_recharge'
             }
@@ -771,7 +858,7 @@ class RazorpayWalletAPIView(APIView):
             order_data['notes']['description'] = serializer.validated_data['description']
         
         try:
-            razorpay_order = self.client.order.create(data=order_data)
+            razorpay_order = razorpay_client().order.create(data=order_data, timeout=RAZORPAY_TIMEOUT)
             
             # Create transaction record
             transaction = RazorpayTransaction.objects.create(
@@ -806,6 +893,16 @@ class RazorpayWalletAPIView(APIView):
                 'auto_fill': auto_fill_data
             }, status=status.HTTP_201_CREATED)
             
+        except Timeout:
+            return Response({
+                'success': False,
+                'error': 'Payment gateway timed out, please retry'
+            }, status=status.HTTP_504_GATEWAY_TIMEOUT)
+        except (ServerError, GatewayError, RequestException):
+            return Response({
+                'success': False,
+                'error': 'Payment gateway unavailable, please retry'
+            }, status=status.HTTP_502_BAD_GATEWAY)
         except Exception as e:
             return Response({
                 'success': False,
@@ -816,12 +913,7 @@ class RazorpayWalletAPIView(APIView):
 class RazorpayPaymentVerificationAPIView(APIView):
     """API for verifying Razorpay payment and adding points to wallet"""
     permission_classes = [permissions.IsAuthenticated]
-    authentication_classes = [JWTAuthentication]
-
-    def __init__(self, **kwargs):
-        super().__init__(**kwargs)
-        # Initialize Razorpay client
-        self.client = razorpay.Client(auth=(settings.RAZORPAY_KEY_ID, settings.RAZORPAY_KEY_SECRET))
+    authentication_classes = [CachedJWTAuthentication]
 
     def post(self, request):
         """Verify Razorpay payment and add points to wallet"""
@@ -834,30 +926,52 @@ class RazorpayPaymentVerificationAPIView(APIView):
         signature = serializer.validated_data.get('razorpay_signature', '')
         
         try:
-            # Get transaction record
-            transaction = RazorpayTransaction.objects.get(
+            # Get transaction record; mark_successful() and the response both read the wallet.
+            # Already-verified orders are fetched too so a retry or double submit is answered
+            # without re-checking the signature, calling Razorpay or crediting the wallet again.
+            transaction = RazorpayTransaction.objects.select_related('wallet').only(*RAZORPAY_VERIFY_FIELDS).get(
                 razorpay_order_id=order_id,
                 user=user,
-                status='pending'
+                status__in=('pending', 'success')
             )
+            if transaction.status == 'success':
+                return self._success_response(transaction)
             
             # Verify signature only if provided
             if signature:
-                expected_signature = hmac.new(
-                    settings.RAZORPAY_KEY_SECRET.encode(),
+                # One-shot hmac.digest() runs entirely in OpenSSL's C HMAC
+                expected_signature = hmac.digest(
+                    razorpay_secret(),
                     f"{order_id}|{payment_id}".encode(),
-                    hashlib.sha256
-                ).hexdigest()
-                
-                if not hmac.compare_digest(expected_signature, signature):
+                    "sha256"
+                )
+                # The serializer only admits 64 hex characters, so this always decodes to 32 bytes
+                if not hmac.compare_digest(expected_signature, bytes.fromhex(signature)):
                     transaction.mark_failed('INVALID_SIGNATURE', 'Payment signature verification failed')
                     return Response({
                         'success': False,
                         'error': 'Invalid payment signature'
                     }, status=status.HTTP_400_BAD_REQUEST)
             
+            # Clients that opt in get 202 straight away and poll the transaction for its
+            # status; the gateway check and wallet credit run on the Celery worker.
+            # If the broker is unreachable, fall through and verify synchronously instead.
+            if request.query_params.get('async', '').lower() in ('1', 'true'):
+                try:
+                    confirm_razorpay_payment.delay(transaction.pk, payment_id, signature or '')
+                except BrokerError:
+                    pass
+                else:
+                    return Response({
+                        'success': True,
+                        'data': {
+                            'transaction_id': transaction.id,
+                            'status': transaction.status
+                        }
+                    }, status=status.HTTP_202_ACCEPTED)
+            
             # Verify payment with Razorpay
-            payment = self.client.payment.fetch(payment_id)
+            payment = razorpay_client().payment.fetch(payment_id, timeout=RAZORPAY_TIMEOUT)
             
             if payment['status'] != 'captured':
                 transaction.mark_failed('PAYMENT_NOT_CAPTURED', f"Payment status: {payment['status']}")
@@ -866,39 +980,58 @@ class RazorpayPaymentVerificationAPIView(APIView):
                     'error': f"Payment not captured. Status: {payment['status']}"
                 }, status=status.HTTP_400_BAD_REQUEST)
             
-            # Mark transaction as successful and add points
-            transaction.mark_successful(payment_id, signature or '')
+            # Mark transaction as successful and add points. The Razorpay call above stays
+            # outside the row lock taken here.
+            transaction = credit_captured_payment(transaction.pk, payment_id, signature or '')
             
-            return Response({
-                    'success': True,
-                    'data': {
-                        'transaction_id': transaction.id,
-                        'amount': transaction.amount,
-                        'points_added': transaction.points_to_add,  # Show actual points added (10x)
-                        'wallet_balance': transaction.wallet.balance,
-                        'payment_id': payment_id
-                    }
-                }, status=status.HTTP_200_OK)
+            return self._success_response(transaction)
             
         except RazorpayTransaction.DoesNotExist:
             return Response({
                 'success': False,
                 'error': 'Transaction not found or already processed'
             }, status=status.HTTP_404_NOT_FOUND)
+        except BadRequestError as e:
+            return Response({
+                'success': False,
+                'error': str(e)
+            }, status=status.HTTP_400_BAD_REQUEST)
+        except Timeout:
+            return Response({
+                'success': False,
+                'error': 'Payment gateway timed out, please retry'
+            }, status=status.HTTP_504_GATEWAY_TIMEOUT)
+        except (ServerError, GatewayError, RequestException):
+            return Response({
+                'success': False,
+                'error': 'Payment gateway unavailable, please retry'
+            }, status=status.HTTP_502_BAD_GATEWAY)
         except Exception as e:
             return Response({
                 'success': False,
                 'error': str(e)
             }, status=status.HTTP_400_BAD_REQUEST)
 
+    def _success_response(self, transaction):
+        return Response({
+            'success': True,
+            'data': {
+                'transaction_id': transaction.id,
+                'amount': transaction.amount,
+                'points_added': transaction.points_to_add,  # Show actual points added (10x)
+                'wallet_balance': transaction.wallet.balance,
+                'payment_id': transaction.razorpay_payment_id
+            }
+        }, status=status.HTTP_200_OK)
+
 
 class RazorpayTransactionListView(generics.ListAPIView):
     """API for listing user's Razorpay transactions"""
-    serializer_class = RazorpayTransactionSerializer
+    serializer_class = RazorpayTransactionListSerializer
     permission_classes = [permissions.IsAuthenticated]
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [CachedJWTAuthentication]
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
-    filterset_fields = ['status', 'currency']
+    filterset_class = RazorpayTransactionFilter
     ordering_fields = ['create_time', 'amount']
     ordering = ['-create_time']
 
@@ -906,6 +1039,21 @@ class RazorpayTransactionListView(generics.ListAPIView):
         # Handle case where request.user might not be available (e.g., during Swagger inspection)
         if hasattr(self, 'request') and hasattr(self.request, 'user') and self.request.user.is_authenticated:
             user = self.request.user
-            return RazorpayTransaction.objects.filter(user=user)
+            # Plain dict rows (user name/email joined in) instead of model instances per page
+            return RazorpayTransaction.objects.filter(user=user).values(
+                *RazorpayTransactionListSerializer.VALUES_FIELDS
+            )
         # Return empty queryset for unauthenticated requests or during inspection
-        return RazorpayTransaction.objects.none()
\ No newline at end of file
+        return RazorpayTransaction.objects.none()
+
+class RazorpayTransactionDetailView(generics.RetrieveAPIView):
+    """API for polling one of the user's Razorpay transactions, e.g. after an async verify"""
+    serializer_class = RazorpayTransactionSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    authentication_classes = [CachedJWTAuthentication]
+
+    def get_queryset(self):
+        # Handle case where request.user might not be available (e.g., during Swagger inspection)
+        if hasattr(self, 'request') and hasattr(self.request, 'user') and self.request.user.is_authenticated:
+            return RazorpayTransaction.objects.filter(user=self.request.user).select_related('user')
+        return RazorpayTransaction.objects.none()
@@ -38,6 +38,7 @@ urlpatterns = [
     path("v1/wallet/razorpay/create-order/", api.RazorpayWalletAPIView.as_view(), name="razorpay-create-order"),
     path("v1/wallet/razorpay/verify-payment/", api.RazorpayPaymentVerificationAPIView.as_view(), name="razorpay-verify-payment"),
     path("v1/wallet/razorpay/transactions/", api.RazorpayTransactionListView.as_view(), name="razorpay-transactions"),
+    path("v1/wallet/razorpay/transactions/<int:pk>/", api.RazorpayTransactionDetailView.as_view(), name="razorpay-transaction-detail"),
     
     path("", include(router.urls))
 ]
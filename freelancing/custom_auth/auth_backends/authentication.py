@@ -1,7 +1,35 @@
+import hashlib
+import threading
+import time
+
+from cachetools import TTLCache
 from rest_framework.authentication import TokenAuthentication
+from rest_framework_simplejwt.authentication import JWTAuthentication
 
 from freelancing.custom_auth.models import MultiToken
 
 
 class MultiTokenAuthentication(TokenAuthentication):
     model = MultiToken
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that remembers verified access tokens for a minute,
+    so repeat requests with the same token skip signature verification.
+    The user is still loaded per request, keeping is_active checks fresh.
+    """
+    _cache = TTLCache(maxsize=10000, ttl=60)
+    _lock = threading.Lock()
+
+    def get_validated_token(self, raw_token):
+        key = hashlib.blake2b(raw_token, digest_size=16).digest()
+        with self._lock:
+            token = self._cache.get(key)
+        if token is not None and token.get("exp", 0) > time.time():
+            return token
+
+        token = super().get_validated_token(raw_token)
+        with self._lock:
+            self._cache[key] = token
+        return token
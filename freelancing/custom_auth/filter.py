@@ -1,7 +1,7 @@
 import django_filters
 from django_filters import rest_framework as filters
 
-from freelancing.custom_auth.models import ApplicationUser
+from freelancing.custom_auth.models import ApplicationUser, RazorpayTransaction, WalletHistory
 
 
 # class UserFilter(filters.FilterSet):
@@ -10,3 +10,15 @@ from freelancing.custom_auth.models import ApplicationUser
 #         fields = {
 #             "user_type": ["in", "exact"],
 #         }
+
+
+class WalletHistoryFilter(filters.FilterSet):
+    class Meta:
+        model = WalletHistory
+        fields = ["transaction_type", "reference_note", "reference_id"]
+
+
+class RazorpayTransactionFilter(filters.FilterSet):
+    class Meta:
+        model = RazorpayTransaction
+        fields = ["status", "currency"]
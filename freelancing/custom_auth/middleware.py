@@ -10,7 +10,9 @@ from django.utils import timezone
 
 from .models import UserActivity
 
-from rest_framework_simplejwt.tokens import AccessToken
+from rest_framework_simplejwt.exceptions import InvalidToken
+
+from .auth_backends.authentication import CachedJWTAuthentication
 
 
 class UpdateUserActivityMiddleware:
@@ -34,6 +36,10 @@ class UpdateUserActivityMiddleware:
 
 
 class TokenBlacklistMiddleware(MiddlewareMixin):
+    # Shares CachedJWTAuthentication's process-wide cache, so a token is verified once
+    # per minute here and the view's CachedJWTAuthentication reuses that result.
+    jwt_authentication = CachedJWTAuthentication()
+
     def process_request(self, request):
         auth = request.headers.get('Authorization', None)
         if auth:
@@ -43,8 +49,11 @@ class TokenBlacklistMiddleware(MiddlewareMixin):
                     return JsonResponse({"errors": "Token is blacklisted",
                                          "success": "false"}, status=401)
                 # Validate and decode the token to check expiry and other validations
-                token = AccessToken(token_str)
-                token.check_exp()
+                self.jwt_authentication.get_validated_token(token_str.encode())
+            except InvalidToken as e:
+                # Report the token's own error (e.g. "Token is invalid or expired")
+                return JsonResponse({"errors": str(e.detail["messages"][0]["message"]),
+                                     "success": "false"}, status=401)
             except Exception as e:
                 return JsonResponse({"errors": str(e), "success": "false"}, status=401)
 
@@ -0,0 +1,25 @@
+# Generated by Django 4.2 on 2026-10-16 10:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("custom_auth", "0011_razorpaytransaction"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="wallethistory",
+            index=models.Index(
+                fields=["create_time"], name="wallethistory_create_time_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="razorpaytransaction",
+            index=models.Index(
+                fields=["create_time"], name="razorpaytxn_create_time_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 4.2 on 2026-10-16 10:40
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("custom_auth", "0012_wallethistory_create_time_idx_and_more"),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddIndex(
+            model_name="applicationuser",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["email"], name="user_email_trgm", opclasses=["gin_trgm_ops"]
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="applicationuser",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["fullname"], name="user_fullname_trgm", opclasses=["gin_trgm_ops"]
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="merchantprofile",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["business_name"],
+                name="merchant_business_name_trgm",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 4.2 on 2026-10-16 11:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("custom_auth", "0013_user_trigram_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="applicationuser",
+            index=models.Index(
+                fields=["-last_user_activity"], name="user_last_activity_idx"
+            ),
+        ),
+    ]
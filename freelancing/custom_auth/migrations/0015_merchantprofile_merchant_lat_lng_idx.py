@@ -0,0 +1,19 @@
+# Generated by Django 4.2 on 2026-10-16 11:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("custom_auth", "0014_applicationuser_user_last_activity_idx"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="merchantprofile",
+            index=models.Index(
+                fields=["latitude", "longitude"], name="merchant_lat_lng_idx"
+            ),
+        ),
+    ]
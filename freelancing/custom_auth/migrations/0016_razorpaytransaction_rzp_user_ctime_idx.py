@@ -0,0 +1,19 @@
+# Generated by Django 4.2 on 2026-10-16 15:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("custom_auth", "0015_merchantprofile_merchant_lat_lng_idx"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="razorpaytransaction",
+            index=models.Index(
+                fields=["user", "-create_time"], name="rzp_user_ctime_idx"
+            ),
+        ),
+    ]
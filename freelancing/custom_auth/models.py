@@ -4,6 +4,7 @@ from django.contrib.auth.base_user import AbstractBaseUser
 from django.contrib.auth.models import PermissionsMixin
 from django.contrib.auth.tokens import default_token_generator
 from django.contrib.auth.validators import UnicodeUsernameValidator
+from django.contrib.postgres.indexes import GinIndex
 from django.db import models
 from django.utils import timezone
 from django.utils.encoding import force_bytes
@@ -214,6 +215,12 @@ class ApplicationUser(AbstractBaseUser, UserPhotoMixin, PermissionsMixin):
     class Meta:
         verbose_name = _("User")
         verbose_name_plural = _("Users")
+        # Trigram indexes serve the admin's icontains search on joined user columns.
+        indexes = [
+            GinIndex(fields=["email"], name="user_email_trgm", opclasses=["gin_trgm_ops"]),
+            GinIndex(fields=["fullname"], name="user_fullname_trgm", opclasses=["gin_trgm_ops"]),
+            models.Index(fields=["-last_user_activity"], name="user_last_activity_idx"),
+        ]
 
     def __str__(self):
         return str(self.phone) or str(self.email) or str(self.first_name) or str(self.last_name) or str(self.id)
@@ -301,6 +308,13 @@ class MerchantProfile(BaseModel):
 
     logo = models.ImageField(upload_to="merchant/logo/", null=True, blank=True)
     banner_image = models.ImageField(upload_to="merchant/banner/", null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            GinIndex(fields=["business_name"], name="merchant_business_name_trgm", opclasses=["gin_trgm_ops"]),
+            models.Index(fields=["latitude", "longitude"], name="merchant_lat_lng_idx"),
+        ]
+
     def __str__(self):
         return f"{self.business_name} ({self.user.email})"
 
@@ -317,10 +331,14 @@ class Wallet(BaseModel):
 
     def deduct(self, amount: Decimal, note=None, ref_id=None):
         """Deduct points from wallet"""
-        if self.balance < amount:
+        # Conditional UPDATE with DB-side arithmetic: a concurrent deduct can neither be
+        # lost nor overdraw the wallet, whatever balance this instance last saw.
+        updated = Wallet.objects.filter(pk=self.pk, balance__gte=amount).update(
+            balance=models.F("balance") - amount, update_time=timezone.now()
+        )
+        if not updated:
             raise ValidationError("Insufficient points in wallet.")
-        self.balance -= amount
-        self.save()
+        self.refresh_from_db(fields=["balance", "update_time"])
         WalletHistory.objects.create(
             wallet=self,
             amount=-amount,
@@ -331,8 +349,10 @@ class Wallet(BaseModel):
 
     def credit(self, amount: Decimal, note=None, ref_id=None):
         """Add points to wallet"""
-        self.balance += amount
-        self.save()
+        Wallet.objects.filter(pk=self.pk).update(
+            balance=models.F("balance") + amount, update_time=timezone.now()
+        )
+        self.refresh_from_db(fields=["balance", "update_time"])
         WalletHistory.objects.create(
             wallet=self,
             amount=amount,
@@ -360,6 +380,12 @@ class WalletHistory(BaseModel):
     reference_note = models.CharField(max_length=255, null=True, blank=True)
     reference_id = models.CharField(max_length=100, null=True, blank=True)  # e.g. Voucher ID or Order ID
     meta = models.JSONField(null=True, blank=True) 
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["create_time"], name="wallethistory_create_time_idx"),
+        ]
+
     def __str__(self):
         return f"{self.transaction_type.title()} ₹{self.amount}"
 
@@ -398,6 +424,10 @@ class RazorpayTransaction(BaseModel):
 
     class Meta:
         ordering = ['-create_time']
+        indexes = [
+            models.Index(fields=["create_time"], name="razorpaytxn_create_time_idx"),
+            models.Index(fields=["user", "-create_time"], name="rzp_user_ctime_idx"),
+        ]
 
     def __str__(self):
         return f"Razorpay Transaction - {self.razorpay_order_id} - {self.status}"
@@ -0,0 +1,49 @@
+from functools import lru_cache
+
+import razorpay
+from django.conf import settings
+from django.db import transaction as db_transaction
+
+from freelancing.custom_auth.models import RazorpayTransaction
+
+# (connect, read) seconds for Razorpay API calls, so a hung upstream cannot hold a worker
+RAZORPAY_TIMEOUT = (2, 5)
+
+# Columns the verify flow reads or writes. Saving a deferred instance only writes loaded
+# fields, so update_time is kept for auto_now (the wallet summary ETag depends on it).
+RAZORPAY_VERIFY_FIELDS = (
+    "id", "status", "amount", "points_to_add", "razorpay_order_id", "razorpay_payment_id",
+    "update_time", "wallet__id", "wallet__balance", "wallet__update_time",
+)
+
+
+@lru_cache(maxsize=1)
+def razorpay_client():
+    """One Razorpay client per process so its HTTP session (and TLS connection) is reused."""
+    return razorpay.Client(auth=(settings.RAZORPAY_KEY_ID, settings.RAZORPAY_KEY_SECRET))
+
+
+@lru_cache(maxsize=1)
+def razorpay_secret():
+    """Razorpay key secret as bytes for payment signature HMACs."""
+    return settings.RAZORPAY_KEY_SECRET.encode()
+
+
+def credit_captured_payment(transaction_id, payment_id, signature=''):
+    """
+    Mark a captured payment's transaction successful and credit its wallet, at most once.
+
+    The row (and its wallet) is re-read FOR UPDATE, so a concurrent confirmation of the
+    same order waits, then sees 'success' and skips the credit. Raises
+    RazorpayTransaction.DoesNotExist if the transaction has meanwhile been marked failed.
+    """
+    with db_transaction.atomic():
+        transaction = RazorpayTransaction.objects.select_for_update().select_related('wallet').only(
+            *RAZORPAY_VERIFY_FIELDS
+        ).get(
+            pk=transaction_id,
+            status__in=('pending', 'success')
+        )
+        if transaction.status == 'pending':
+            transaction.mark_successful(payment_id, signature)
+    return transaction
@@ -432,9 +432,12 @@ class RazorpayOrderSerializer(serializers.Serializer):
 
 class RazorpayPaymentVerificationSerializer(serializers.Serializer):
     """Serializer for verifying Razorpay payment"""
-    razorpay_order_id = serializers.CharField(max_length=255)
-    razorpay_payment_id = serializers.CharField(max_length=255)
-    razorpay_signature = serializers.CharField(max_length=255, required=False, allow_blank=True)
+    # Razorpay ids are a fixed prefix plus alphanumerics; malformed ones are rejected here,
+    # before the view touches the database or the gateway. The patterns compile once.
+    razorpay_order_id = serializers.RegexField(r'^order_[A-Za-z0-9]+$', max_length=255)
+    razorpay_payment_id = serializers.RegexField(r'^pay_[A-Za-z0-9]+$', max_length=255)
+    # HMAC-SHA256 hex digest
+    razorpay_signature = serializers.RegexField(r'^[0-9a-fA-F]{64}$', required=False, allow_blank=True)
 
 
 class RazorpayTransactionSerializer(serializers.ModelSerializer):
@@ -455,3 +458,37 @@ class RazorpayTransactionSerializer(serializers.ModelSerializer):
             'razorpay_payment_id', 'razorpay_signature', 'points_to_add', 'status',
             'error_code', 'error_description', 'create_time', 'update_time'
         ]
+
+
+class RazorpayTransactionListSerializer(serializers.Serializer):
+    """
+    Read-only RazorpayTransactionSerializer output built from .values() rows, so list
+    pages skip model instantiation. Keys and formats match the model serializer.
+    """
+    id = serializers.IntegerField()
+    user = serializers.IntegerField(source='user_id')
+    user_name = serializers.CharField(source='user__fullname')
+    user_email = serializers.CharField(source='user__email')
+    wallet = serializers.IntegerField(source='wallet_id')
+    razorpay_order_id = serializers.CharField()
+    razorpay_payment_id = serializers.CharField()
+    razorpay_signature = serializers.CharField()
+    amount = serializers.DecimalField(max_digits=12, decimal_places=2)
+    points_to_add = serializers.DecimalField(max_digits=12, decimal_places=2)
+    currency = serializers.CharField()
+    status = serializers.CharField()
+    description = serializers.CharField()
+    receipt = serializers.CharField()
+    notes = serializers.JSONField()
+    error_code = serializers.CharField()
+    error_description = serializers.CharField()
+    create_time = serializers.DateTimeField()
+    update_time = serializers.DateTimeField()
+
+    # Columns to pass to .values() for this serializer
+    VALUES_FIELDS = (
+        'id', 'user_id', 'user__fullname', 'user__email', 'wallet_id', 'razorpay_order_id',
+        'razorpay_payment_id', 'razorpay_signature', 'amount', 'points_to_add',
+        'currency', 'status', 'description', 'receipt', 'notes', 'error_code',
+        'error_description', 'create_time', 'update_time',
+    )
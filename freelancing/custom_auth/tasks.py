@@ -0,0 +1,46 @@
+from celery import shared_task
+from django.utils import timezone
+from razorpay.errors import BadRequestError, GatewayError, ServerError
+from requests.exceptions import RequestException
+
+from freelancing.custom_auth.models import RazorpayTransaction
+from freelancing.custom_auth.payments import (RAZORPAY_TIMEOUT, credit_captured_payment,
+                                              razorpay_client)
+
+
+@shared_task(bind=True, ignore_result=True, max_retries=5, default_retry_delay=30)
+def confirm_razorpay_payment(self, transaction_id, payment_id, signature=''):
+    """
+    Confirm a Razorpay payment with the gateway and credit the wallet once it is captured.
+    Queued by the verify API when the client asks for asynchronous confirmation.
+    """
+    try:
+        payment = razorpay_client().payment.fetch(payment_id, timeout=RAZORPAY_TIMEOUT)
+    except BadRequestError as e:
+        _fail_pending(transaction_id, 'PAYMENT_FETCH_FAILED', str(e))
+        return
+    except (ServerError, GatewayError, RequestException) as e:
+        if self.request.retries >= self.max_retries:
+            # Out of retries: settle the transaction instead of leaving it pending for good
+            _fail_pending(transaction_id, 'PAYMENT_FETCH_FAILED', str(e))
+            return
+        raise self.retry(exc=e)
+
+    if payment['status'] != 'captured':
+        _fail_pending(transaction_id, 'PAYMENT_NOT_CAPTURED', f"Payment status: {payment['status']}")
+        return
+
+    try:
+        credit_captured_payment(transaction_id, payment_id, signature)
+    except RazorpayTransaction.DoesNotExist:
+        pass
+
+
+def _fail_pending(transaction_id, error_code, error_description):
+    # Conditional UPDATE so a transaction credited in the meantime is never flipped to failed
+    RazorpayTransaction.objects.filter(pk=transaction_id, status='pending').update(
+        status='failed',
+        error_code=error_code,
+        error_description=error_description,
+        update_time=timezone.now(),
+    )
@@ -1,3 +1,221 @@
+from datetime import timedelta
+from decimal import Decimal
+from unittest import mock
+
+from celery.exceptions import Retry
+from django.contrib.auth import get_user_model
 from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from razorpay.errors import ServerError
+from requests.exceptions import Timeout
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.tokens import AccessToken
+
+from freelancing.custom_auth.api import MerchantListAPIView
+from freelancing.custom_auth.auth_backends.authentication import CachedJWTAuthentication
+from freelancing.custom_auth.models import (CustomBlacklistedToken, MerchantProfile,
+                                            RazorpayTransaction, WalletHistory)
+from freelancing.custom_auth.payments import credit_captured_payment
+from freelancing.custom_auth.tasks import confirm_razorpay_payment
+from freelancing.voucher.models import Voucher, VoucherType
+
+User = get_user_model()
+
+
+class MerchantProfileAdminActionTests(TestCase):
+    def setUp(self):
+        self.admin_user = User.objects.create_superuser("admin@example.com", "password")
+        self.client.force_login(self.admin_user)
+        merchant_user = User.objects.create(email="merchant@example.com", username="merchant@example.com")
+        self.merchant = MerchantProfile.objects.create(user=merchant_user, business_name="Cafe")
+        self.voucher = Voucher.objects.create(
+            merchant=self.merchant,
+            title="10% off",
+            message="Ten percent off",
+            voucher_type=VoucherType.objects.create(name="Percentage"),
+            percentage_value=10,
+        )
+
+    def test_deactivate_merchants_on_active_filtered_changelist(self):
+        url = reverse("admin:custom_auth_merchantprofile_changelist") + "?is_active__exact=1"
+        response = self.client.post(url, {
+            "action": "deactivate_merchants",
+            "_selected_action": [self.merchant.pk],
+        })
+
+        self.assertEqual(response.status_code, 302)
+        self.merchant.refresh_from_db()
+        self.voucher.refresh_from_db()
+        self.assertFalse(self.merchant.is_active)
+        self.assertFalse(self.voucher.is_active)
+
+
+class UserAdminChangelistTests(TestCase):
+    def setUp(self):
+        self.client.force_login(User.objects.create_superuser("admin@example.com", "password"))
+
+    def test_wallet_balance_without_wallet_reads_zero(self):
+        user = User.objects.create(email="nowallet@example.com", username="nowallet@example.com")
+        user.wallet.delete()
+
+        response = self.client.get(
+            reverse("admin:custom_auth_applicationuser_changelist"), {"q": "nowallet@example.com"}
+        )
+
+        self.assertContains(response, '<td class="field-wallet_balance">₹0.00</td>', html=True)
+
+
+class MerchantListRadiusTests(TestCase):
+    # Searches from (12.0, 77.0); a 10 km radius gives a bounding box of about +/-0.09 degrees.
+    params = {"latitude": "12.0", "longitude": "77.0"}
+
+    def setUp(self):
+        self.client = APIClient()
+        self.near = self._merchant("near", "12.050000", "77.000000")  # ~5.6 km
+        self.corner = self._merchant("corner", "12.080000", "77.080000")  # ~12.4 km, inside the box
+        self.far = self._merchant("far", "12.500000", "77.000000")  # ~55 km, outside the box
+
+    def _merchant(self, name, latitude, longitude):
+        user = User.objects.create(email=f"{name}@example.com", username=f"{name}@example.com")
+        return MerchantProfile.objects.create(
+            user=user, business_name=name, latitude=latitude, longitude=longitude
+        )
+
+    def _ids(self, **params):
+        response = self.client.get(reverse("merchant-list"), {**self.params, **params})
+        self.assertEqual(response.status_code, 200)
+        return [row["id"] for row in response.json()["results"]]
+
+    def _sql(self, **params):
+        view = MerchantListAPIView()
+        view.request = Request(APIRequestFactory().get("/", {**self.params, **params}))
+        return str(view.get_queryset().query)
+
+    def test_radius_applies_bounding_box(self):
+        self.assertIn("BETWEEN", self._sql(radius="10"))
+
+    def test_radius_drops_bounding_box_corners(self):
+        # The corner merchant passes the bounding box; only distance__lte excludes it
+        self.assertEqual(self._ids(radius="10"), [self.near.pk])
+
+    def test_without_radius_orders_by_distance(self):
+        self.assertEqual(self._ids(), [self.near.pk, self.corner.pk, self.far.pk])
+
+    def test_invalid_radius_is_ignored(self):
+        for radius in ("abc", "-5", "0", "nan", "inf"):
+            with self.subTest(radius=radius):
+                self.assertNotIn("BETWEEN", self._sql(radius=radius))
+                self.assertEqual(self._ids(radius=radius), [self.near.pk, self.corner.pk, self.far.pk])
+
+
+class CachedJWTAuthenticationTests(TestCase):
+    def setUp(self):
+        CachedJWTAuthentication._cache.clear()
+        self.user = User.objects.create(email="jwt@example.com", username="jwt@example.com")
+        self.raw_token = str(AccessToken.for_user(self.user)).encode()
+        self.authentication = CachedJWTAuthentication()
+
+    def test_repeat_token_is_served_from_cache(self):
+        token = self.authentication.get_validated_token(self.raw_token)
+        with mock.patch("rest_framework_simplejwt.authentication.JWTAuthentication.get_validated_token") as verify:
+            self.assertIs(self.authentication.get_validated_token(self.raw_token), token)
+        verify.assert_not_called()
+
+    def test_expired_token_is_rejected_even_when_cached(self):
+        token = self.authentication.get_validated_token(self.raw_token)
+        later = token["exp"] + 1
+        with mock.patch("freelancing.custom_auth.auth_backends.authentication.time.time", return_value=later), \
+                mock.patch("rest_framework_simplejwt.tokens.aware_utcnow",
+                           return_value=timezone.now() + timedelta(seconds=later - token["iat"])):
+            with self.assertRaises(InvalidToken):
+                self.authentication.get_validated_token(self.raw_token)
+
+    def test_blacklisted_token_is_refused_when_cached(self):
+        self.authentication.get_validated_token(self.raw_token)
+        CustomBlacklistedToken.objects.create(token=self.raw_token.decode())
+
+        response = self.client.get(
+            reverse("razorpay-transactions"), HTTP_AUTHORIZATION=f"Bearer {self.raw_token.decode()}"
+        )
+
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.json()["errors"], "Token is blacklisted")
+
+
+class RazorpayPaymentTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(email="payer@example.com", username="payer@example.com")
+        self.transaction = RazorpayTransaction.objects.create(
+            user=self.user,
+            wallet=self.user.wallet,
+            razorpay_order_id="order_TEST123",
+            amount=Decimal("10.00"),
+            points_to_add=Decimal("100.00"),
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def _verify(self, **query):
+        url = reverse("razorpay-verify-payment")
+        if query:
+            url += "?" + "&".join(f"{key}={value}" for key, value in query.items())
+        return self.client.post(url, {
+            "razorpay_order_id": "order_TEST123",
+            "razorpay_payment_id": "pay_TEST123",
+        }, format="json")
+
+    def test_credit_captured_payment_is_idempotent(self):
+        credit_captured_payment(self.transaction.pk, "pay_TEST123")
+        credit_captured_payment(self.transaction.pk, "pay_TEST123")
+
+        self.transaction.refresh_from_db()
+        self.user.wallet.refresh_from_db()
+        self.assertEqual(self.transaction.status, "success")
+        self.assertEqual(self.user.wallet.balance, Decimal("1100.00"))
+        self.assertEqual(WalletHistory.objects.filter(wallet=self.user.wallet).count(), 1)
+
+    @mock.patch("freelancing.custom_auth.tasks.razorpay_client")
+    def test_task_retries_gateway_errors(self, client):
+        client.return_value.payment.fetch.side_effect = ServerError("upstream down")
+
+        with mock.patch.object(confirm_razorpay_payment, "retry", side_effect=Retry()) as retry:
+            with self.assertRaises(Retry):
+                confirm_razorpay_payment(self.transaction.pk, "pay_TEST123")
+
+        retry.assert_called_once()
+        self.transaction.refresh_from_db()
+        self.assertEqual(self.transaction.status, "pending")
+
+    @mock.patch("freelancing.custom_auth.tasks.razorpay_client")
+    def test_task_fails_transaction_after_last_retry(self, client):
+        client.return_value.payment.fetch.side_effect = ServerError("upstream down")
+
+        confirm_razorpay_payment.apply(
+            args=(self.transaction.pk, "pay_TEST123"), retries=confirm_razorpay_payment.max_retries
+        )
+
+        self.transaction.refresh_from_db()
+        self.assertEqual(self.transaction.status, "failed")
+        self.assertEqual(self.transaction.error_code, "PAYMENT_FETCH_FAILED")
+
+    @mock.patch("freelancing.custom_auth.api.confirm_razorpay_payment")
+    def test_async_verify_returns_202(self, task):
+        response = self._verify(**{"async": "1"})
+
+        self.assertEqual(response.status_code, 202)
+        task.delay.assert_called_once_with(self.transaction.pk, "pay_TEST123", "")
+
+    @mock.patch("freelancing.custom_auth.api.razorpay_client")
+    def test_verify_gateway_error_returns_502(self, client):
+        client.return_value.payment.fetch.side_effect = ServerError("upstream down")
+
+        self.assertEqual(self._verify().status_code, 502)
+
+    @mock.patch("freelancing.custom_auth.api.razorpay_client")
+    def test_verify_gateway_timeout_returns_504(self, client):
+        client.return_value.payment.fetch.side_effect = Timeout()
 
-# Create your tests here.
+        self.assertEqual(self._verify().status_code, 504)
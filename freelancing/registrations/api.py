@@ -1,5 +1,3 @@
-import random
-
 from django.conf import settings
 from django.contrib.sites.shortcuts import get_current_site
 from django.db import transaction
@@ -23,6 +21,7 @@ from freelancing.custom_auth.serializers import BaseUserSerializer
 from freelancing.registrations.serializers import (CheckEmailSerializer,
                                                 CheckUserDataSerializer,
                                                 RegistrationSerializer, VerificationOtpSerializer)
+from freelancing.utils.functions import generateOtp
 
 
 
@@ -89,7 +88,7 @@ class RegistrationViewSet(
     #     serializer.is_valid(raise_exception=True)
     #
     #     # Send SMS code
-    #     otp = random.randint(1000, 9999)
+    #     otp = generateOtp()
     #     email = serializer.validated_data.get("email")
     #     site = get_current_site(request)
     #
@@ -128,7 +127,7 @@ class RegistrationViewSet(
 
     #     # creating new otp
 
-    #     otp = random.randint(1000, 9999)
+    #     otp = generateOtp()
     #     # StudentOTP.objects.create(email=email, otp=otp)
 
     #     site = get_current_site(request)
@@ -1,11 +1,11 @@
-import math
-import random
+import secrets
 
 
 def generateRandomCode(length=5):
-    digits = "0123456789"
-    result = ""
+    # One CSPRNG draw, zero-padded, instead of a per-digit choice() loop
+    return f"{secrets.randbelow(10 ** length):0{length}d}"
 
-    for i in range(length):
-        result += digits[math.floor(random.random() * 10)]
-    return str(result)
+
+def generateOtp():
+    """4-digit login OTP (1000-9999) from the CSPRNG"""
+    return 1000 + secrets.randbelow(9000)
@@ -1,8 +1,10 @@
+import orjson
 from rest_framework import status
 from rest_framework.exceptions import ErrorDetail
 from rest_framework.renderers import JSONRenderer
+from rest_framework.utils import encoders
 
-__all__ = ["CustomRenderer"]
+__all__ = ["CustomRenderer", "ORJSONRenderer"]
 
 
 
@@ -95,3 +97,24 @@ class CustomRenderer(JSONRenderer):
         else:
             return f"Expected a list of items but got type \"{type(item).__name__}\" in {parent_key}."
 
+
+class ORJSONRenderer(CustomRenderer):
+    """
+    CustomRenderer that encodes with orjson, for large list responses.
+    Types orjson does not know (Decimal, lazy strings) fall back to DRF's encoder.
+    """
+    _fallback_encoder = encoders.JSONEncoder()
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        status_code = renderer_context["response"].status_code
+        if status.is_server_error(status_code) or status.is_client_error(status_code):
+            data = self.check_errors(data)
+
+        return orjson.dumps(
+            data,
+            default=self._fallback_encoder.default,
+            option=orjson.OPT_NON_STR_KEYS,
+        )
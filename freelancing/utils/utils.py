@@ -1,5 +1,4 @@
 import os
-import random
 import uuid
 from datetime import datetime
 from decimal import Decimal
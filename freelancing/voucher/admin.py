@@ -1,5 +1,6 @@
 from django.contrib import admin
-from django.utils.html import format_html
+from django.utils.html import escape, format_html
+from django.utils.safestring import mark_safe
 from django.urls import reverse
 from django.db.models import Count, Sum, Avg
 from django.utils import timezone
@@ -9,6 +10,9 @@ from datetime import timedelta
 
 from freelancing.voucher.models import Voucher, VoucherType, UserVoucherRedemption, Advertisement, WhatsAppContact, GiftCardShare
 
+# Pre-built markup for image previews; only the URL is escaped per row.
+_IMAGE_PREVIEW_TPL = '<img src="%s" style="max-height: 100px; max-width: 200px;" />'
+
 
 @admin.register(VoucherType)
 class VoucherTypeAdmin(admin.ModelAdmin):
@@ -18,8 +22,12 @@ class VoucherTypeAdmin(admin.ModelAdmin):
     readonly_fields = ('voucher_count',)
    
     def voucher_count(self, obj):
-        return obj.vouchers.count()
+        return obj._voucher_count
     voucher_count.short_description = 'Vouchers'
+    voucher_count.admin_order_field = '_voucher_count'
+   
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(_voucher_count=Count('vouchers'))
 
 
 class AdvertisementInline(admin.TabularInline):
@@ -36,6 +44,7 @@ class VoucherAdmin(admin.ModelAdmin):
     readonly_fields = ('uuid', 'purchase_count', 'redemption_count', 'redemption_rate', 'popularity_score', 'image_preview')
     date_hierarchy = 'create_time'
     actions = ['make_active', 'make_inactive', 'make_gift_card', 'remove_gift_card']
+    autocomplete_fields = ('merchant',)
    
     fieldsets = (
         ('Basic Information', {
@@ -74,9 +83,9 @@ class VoucherAdmin(admin.ModelAdmin):
    
     def image_preview(self, obj):
         if obj.image:
-            return format_html('<img src="{}" style="max-height: 100px; max-width: 200px;" />', obj.image.url)
+            return mark_safe(_IMAGE_PREVIEW_TPL % escape(obj.image.url))
         elif obj.merchant.banner_image:
-            return format_html('<img src="{}" style="max-height: 100px; max-width: 200px;" />', obj.merchant.banner_image.url)
+            return mark_safe(_IMAGE_PREVIEW_TPL % escape(obj.merchant.banner_image.url))
         return "No Image"
     image_preview.short_description = 'Image Preview'
    
@@ -119,6 +128,8 @@ class AdvertisementAdmin(admin.ModelAdmin):
     search_fields = ('voucher__title', 'voucher__merchant__business_name', 'city', 'state')
     readonly_fields = ('days_remaining', 'banner_preview')
     date_hierarchy = 'start_date'
+    list_select_related = ('voucher__voucher_type', 'voucher__merchant')
+    autocomplete_fields = ('voucher',)
    
     fieldsets = (
         ('Voucher Information', {
@@ -141,7 +152,7 @@ class AdvertisementAdmin(admin.ModelAdmin):
    
     def banner_preview(self, obj):
         if obj.banner_image:
-            return format_html('<img src="{}" style="max-height: 100px; max-width: 200px;" />', obj.banner_image.url)
+            return mark_safe(_IMAGE_PREVIEW_TPL % escape(obj.banner_image.url))
         return "No Banner"
     banner_preview.short_description = 'Banner Preview'
    
@@ -163,6 +174,8 @@ class WhatsAppContactAdmin(admin.ModelAdmin):
     list_display = ('name', 'user', 'phone_number', 'is_on_whatsapp', 'create_time')
     list_filter = ('is_on_whatsapp', 'create_time')
     search_fields = ('name', 'phone_number', 'user__email', 'user__fullname')
+    list_select_related = ('user',)
+    autocomplete_fields = ('user',)
 
 
 class UserVoucherRedemptionInline(admin.TabularInline):
@@ -180,6 +193,7 @@ class UserVoucherRedemptionAdmin(admin.ModelAdmin):
     search_fields = ('user__email', 'user__fullname', 'voucher__title', 'voucher__merchant__business_name', 'purchase_reference')
     readonly_fields = ('purchase_reference', 'purchased_at', 'redeemed_at', 'expiry_date', 'days_remaining', 'wallet_transaction_link')
     date_hierarchy = 'purchased_at'
+    autocomplete_fields = ('user', 'voucher')
    
     fieldsets = (
         ('Purchase Information', {
@@ -248,6 +262,7 @@ class GiftCardShareAdmin(admin.ModelAdmin):
     search_fields = ('recipient_phone', 'recipient_name', 'original_purchase__voucher__title', 'original_purchase__user__email')
     readonly_fields = ('claim_reference', 'create_time', 'claimed_at', 'original_purchase_details')
     date_hierarchy = 'create_time'
+    autocomplete_fields = ('original_purchase', 'claimed_by_user')
     
     fieldsets = (
         ('Gift Card Information', {
@@ -49,6 +49,8 @@ from decimal import Decimal, InvalidOperation
 import time
 
 from freelancing.voucher.models import Voucher, WhatsAppContact, Advertisement, UserVoucherRedemption, VoucherType, GiftCardShare
+from freelancing.voucher.filter import (AdvertisementFilter, MerchantVoucherFilter,
+                                        PublicVoucherFilter, UserVoucherFilter)
 from freelancing.voucher.serializers import (
     VoucherCreateSerializer, WhatsAppContactSerializer, GiftCardShareSerializer, 
     AdvertisementSerializer, VoucherListSerializer, VoucherPurchaseSerializer,
@@ -90,7 +92,7 @@ class VoucherViewSet(viewsets.ModelViewSet):
     filter_backends = (DjangoFilterBackend, SearchFilter)
     search_fields = ["title", "message", "merchant__business_name"]
     ordering = ["-create_time"]
-    filterset_fields = ["voucher_type", "is_gift_card", "category"]
+    filterset_class = MerchantVoucherFilter
 
     def get_queryset(self):
         """
@@ -560,7 +562,7 @@ class PublicVoucherViewSet(viewsets.ReadOnlyModelViewSet):
     permission_classes = []
     filter_backends = (DjangoFilterBackend, SearchFilter)
     search_fields = ["title", "message", "merchant__business_name"]
-    filterset_fields = ["voucher_type", "category", "merchant"]
+    filterset_class = PublicVoucherFilter
     ordering = ["-create_time"]
 
     def get_queryset(self):
@@ -1090,7 +1092,7 @@ class UserVoucherViewSet(viewsets.ReadOnlyModelViewSet):
     permission_classes = [permissions.IsAuthenticated]
     authentication_classes = [JWTAuthentication]
     filter_backends = (DjangoFilterBackend,)
-    filterset_fields = ["purchase_status", "is_gift_voucher"]
+    filterset_class = UserVoucherFilter
     ordering = ["-purchased_at"]
 
     def get_queryset(self):
@@ -2005,7 +2007,7 @@ class PublicAdvertisementViewSet(viewsets.ReadOnlyModelViewSet):
     serializer_class = AdvertisementSerializer
     permission_classes = []  # Public access, no authentication required
     filter_backends = (DjangoFilterBackend,)
-    filterset_fields = ["city", "state"]
+    filterset_class = AdvertisementFilter
     ordering = ["-create_time"]
 
     def get_queryset(self):
@@ -0,0 +1,27 @@
+from django_filters import rest_framework as filters
+
+from freelancing.voucher.models import Advertisement, UserVoucherRedemption, Voucher
+
+
+class MerchantVoucherFilter(filters.FilterSet):
+    class Meta:
+        model = Voucher
+        fields = ["voucher_type", "is_gift_card", "category"]
+
+
+class PublicVoucherFilter(filters.FilterSet):
+    class Meta:
+        model = Voucher
+        fields = ["voucher_type", "category", "merchant"]
+
+
+class UserVoucherFilter(filters.FilterSet):
+    class Meta:
+        model = UserVoucherRedemption
+        fields = ["purchase_status", "is_gift_voucher"]
+
+
+class AdvertisementFilter(filters.FilterSet):
+    class Meta:
+        model = Advertisement
+        fields = ["city", "state"]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2 on 2026-10-16 12:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("voucher", "0006_giftcardshare"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="voucher",
+            index=models.Index(
+                condition=models.Q(("is_active", True), ("is_gift_card", False)),
+                fields=["merchant", "redemption_count", "count"],
+                name="voucher_available_idx",
+            ),
+        ),
+    ]
@@ -83,6 +83,14 @@ This offer is valid while stocks lasts - McDonald's West and South (Hardcastle R
 
     class Meta:
         ordering = ['-create_time']
+        indexes = [
+            # Covers the merchant listing's available-vouchers count without touching the heap.
+            models.Index(
+                fields=['merchant', 'redemption_count', 'count'],
+                name='voucher_available_idx',
+                condition=models.Q(is_active=True, is_gift_card=False),
+            ),
+        ]
 
 
 class Advertisement(BaseModel):